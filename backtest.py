@@ -3,13 +3,25 @@ import pandas as pd
 from pathlib import Path
 from typing import Optional, List
 import argparse
+from itertools import takewhile
 
 from strategy import Strategy, SignalType
-from risk import RiskManager, TradeResult
+from risk import RiskManager, TradeResult, Bar
 from reporting import ReportGenerator
 from monte_carlo import MonteCarloSimulator
 from walk_forward import WalkForwardValidator
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Enum members looked up once instead of through SignalType on every bar
+SIGNAL_NONE = SignalType.NONE
+SIGNAL_LONG = SignalType.LONG
+
 
 class BacktestEngine:
     def __init__(self, config_path: str = 'config.json'):
@@ -28,7 +40,20 @@ class BacktestEngine:
             return json.load(f)
     
     def load_data(self, data_path: str = 'data.csv') -> pd.DataFrame:
-        df = pd.read_csv(data_path, comment='#')  # Skip comment lines
+        if PYARROW_AVAILABLE:
+            # Arrow's reader has no comment option, so skip the '#' header
+            # block written by fetch_extended_data.py by line count
+            with open(data_path, 'r') as f:
+                header_lines = sum(1 for _ in takewhile(lambda line: line.startswith('#'), f))
+            # Timestamps stay strings: Arrow would convert offset-stamped
+            # times to UTC, while pd.to_datetime keeps the file's own offset
+            df = pacsv.read_csv(
+                data_path,
+                read_options=pacsv.ReadOptions(skip_rows=header_lines),
+                convert_options=pacsv.ConvertOptions(column_types={'timestamp': pa.string()})
+            ).to_pandas()
+        else:
+            df = pd.read_csv(data_path, comment='#')  # Skip comment lines
         
         required_cols = ['timestamp', 'open', 'high', 'low', 'close']
         for col in required_cols:
@@ -88,51 +113,73 @@ class BacktestEngine:
         entry_offset_ticks = self.config.get('limit_order_retest', {}).get('entry_offset_ticks', 1)
         tick_size = self.config.get('tick_size', 0.10)
         
+        # Pull the columns the bar loop needs out of the DataFrame once;
+        # df.iloc[i] would build a boxed Series for every bar
+        timestamps = df['timestamp'].tolist()
+        dates = df['timestamp'].dt.date.to_numpy()
+        highs = df['high'].to_numpy()
+        lows = df['low'].to_numpy()
+        closes = df['close'].to_numpy()
+        
+        # Resolve config flags and bound methods once; attribute lookups on
+        # self.risk_manager / self.strategy are otherwise repeated every bar
+        role_reversal_enabled = self.config.get('zone_role_reversal', {}).get('enabled', True)
+        rm = self.risk_manager
+        results = self.results
+        invalidate_broken_zones = self.strategy.zone_manager.invalidate_broken_zones
+        generate_signal = self.strategy.generate_signal
+        tick_cooldown = rm.tick_cooldown
+        has_pending_orders = rm.has_pending_orders
+        check_pending_orders = rm.check_pending_orders
+        update_position = rm.update_position
+        can_trade_today = rm.can_trade
+        get_daily_trades = rm.get_daily_trades
+        get_daily_pnl = rm.get_daily_pnl
+        is_in_cooldown = rm.is_in_cooldown
+        
         for i in range(len(df)):
-            bar = df.iloc[i]
-            date = pd.Timestamp(bar['timestamp']).date()
+            bar = Bar(timestamps[i], highs[i], lows[i], closes[i])
+            date = dates[i]
             
             # Check for broken zones and convert them (role reversal) if enabled
-            role_reversal_enabled = self.config.get('zone_role_reversal', {}).get('enabled', True)
             if role_reversal_enabled:
-                converted_zones = self.strategy.zone_manager.invalidate_broken_zones(
-                    bar['close'], i
-                )
+                converted_zones = invalidate_broken_zones(closes[i], i)
             
-            self.risk_manager.tick_cooldown()
+            tick_cooldown()
             
             # Check pending limit orders first
-            if self.risk_manager.has_pending_orders() and self.risk_manager.current_position is None:
-                filled_pos = self.risk_manager.check_pending_orders(bar, i, date)
+            if has_pending_orders() and rm.current_position is None:
+                filled_pos = check_pending_orders(bar, i, date)
                 if filled_pos is not None:
                     # Position was just opened via limit order, continue to next bar
                     continue
             
-            if self.risk_manager.current_position is not None:
-                result, _ = self.risk_manager.update_position(bar, i)
+            if rm.current_position is not None:
+                result, _ = update_position(bar, i)
                 if result is not None:
-                    self.results.append(result)
+                    results.append(result)
                 continue
             
-            can_trade, reason = self.risk_manager.can_trade(date)
+            can_trade, reason = can_trade_today(date)
             if not can_trade:
                 continue
             
-            signal = self.strategy.generate_signal(
+            signal = generate_signal(
                 df=df,
                 bar_index=i,
-                daily_trades=self.risk_manager.get_daily_trades(date),
-                daily_pnl=self.risk_manager.get_daily_pnl(date),
-                in_cooldown=self.risk_manager.is_in_cooldown()
+                daily_trades=get_daily_trades(date),
+                daily_pnl=get_daily_pnl(date),
+                in_cooldown=is_in_cooldown()
             )
             
             if signal is None:
                 continue
             
-            if signal.signal_type == SignalType.NONE:
+            signal_type = signal.signal_type
+            if signal_type is SIGNAL_NONE:
                 continue
             
-            side = 'long' if signal.signal_type == SignalType.LONG else 'short'
+            side = 'long' if signal_type is SIGNAL_LONG else 'short'
             
             if limit_order_enabled:
                 # Create pending limit order instead of entering immediately
@@ -155,7 +202,7 @@ class BacktestEngine:
                     risk_ticks = risk / tick_size
                     reward_ticks = reward / tick_size
                     
-                    self.risk_manager.create_pending_order(
+                    rm.create_pending_order(
                         side=side,
                         limit_price=limit_price,
                         stop_loss=signal.stop_loss,
@@ -171,7 +218,7 @@ class BacktestEngine:
                     )
             else:
                 # Immediate market order entry
-                self.risk_manager.open_position(
+                rm.open_position(
                     side=side,
                     entry_price=signal.entry_price,
                     entry_time=signal.timestamp,
@@ -236,7 +283,7 @@ class BacktestEngine:
     def generate_reports(self, output_dir: str = '.') -> dict:
         output_path = Path(output_dir)
         
-        trades_df = self.report_generator.results_to_dataframe(self.results)
+        _, trades_df = self.report_generator.prepare(self.results)
         trades_path = output_path / 'trades.csv'
         trades_df.to_csv(trades_path, index=False)
         
@@ -267,24 +314,30 @@ class BacktestEngine:
         df = temp_strategy.prepare_data(data)
         results = []
         
+        timestamps = df['timestamp'].tolist()
+        dates = df['timestamp'].dt.date.to_numpy()
+        highs = df['high'].to_numpy()
+        lows = df['low'].to_numpy()
+        closes = df['close'].to_numpy()
+        
         for i in range(len(df)):
-            bar = df.iloc[i]
-            date = pd.Timestamp(bar['timestamp']).date()
+            date = dates[i]
             
             temp_risk.tick_cooldown()
             
             if temp_risk.current_position is not None:
-                current_price = bar['close']
+                current_price = closes[i]
                 if temp_risk.should_force_exit(date, current_price):
                     result = temp_risk.force_close_position(
                         exit_price=current_price,
-                        timestamp=pd.Timestamp(bar['timestamp']),
+                        timestamp=timestamps[i],
                         bar_index=i
                     )
                     if result is not None:
                         results.append(result)
                     continue
                 
+                bar = Bar(timestamps[i], highs[i], lows[i], current_price)
                 result, _ = temp_risk.update_position(bar, i)
                 if result is not None:
                     results.append(result)
@@ -302,10 +355,10 @@ class BacktestEngine:
                 in_cooldown=temp_risk.is_in_cooldown()
             )
             
-            if signal is None or signal.signal_type == SignalType.NONE:
+            if signal is None or signal.signal_type is SIGNAL_NONE:
                 continue
             
-            side = 'long' if signal.signal_type == SignalType.LONG else 'short'
+            side = 'long' if signal.signal_type is SIGNAL_LONG else 'short'
             
             temp_risk.open_position(
                 side=side,
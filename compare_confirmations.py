@@ -1,11 +1,14 @@
+import contextlib
 import json
-import subprocess
+import multiprocessing as mp
+import os
+from copy import deepcopy
 from pathlib import Path
-import re
 
-# Load base config
-with open('config.json', 'r') as f:
-    base_config = json.load(f)
+from backtest import BacktestEngine
+
+# Longest wait for the next scenario to finish before giving up on the rest
+SCENARIO_TIMEOUT = 600
 
 # Test scenarios
 scenarios = [
@@ -47,15 +50,25 @@ scenarios = [
     }
 ]
 
-results = []
 
-for scenario in scenarios:
-    print(f"\n{'='*70}")
-    print(f"Testing: {scenario['description']} ({scenario['name']})")
-    print(f"{'='*70}")
+def summary_metrics(metrics: dict) -> dict:
+    """Round calculate_metrics() output to the units backtest.py prints."""
+    return {
+        'total_trades': metrics.get('total_trades', 0),
+        'win_rate': round(metrics.get('win_rate', 0) * 100, 1),
+        'total_pnl': round(metrics.get('total_pnl', 0), 2),
+        'avg_pnl_per_trade': round(metrics.get('avg_pnl_per_trade', 0), 2),
+        'profit_factor': round(metrics.get('profit_factor', 0), 2),
+        'max_drawdown': round(metrics.get('max_drawdown', 0), 2),
+    }
+
+
+def run_scenario(job):
+    """Run one scenario's backtest in-process (pool worker)."""
+    index, scenario, base_config = job
     
-    # Update config
-    test_config = base_config.copy()
+    # Deep copy so scenarios never share the nested 'confirmation' dict
+    test_config = deepcopy(base_config)
     test_config['confirmation'].update(scenario['config'])
     
     # Save temporary config
@@ -63,145 +76,155 @@ for scenario in scenarios:
     with open(temp_config, 'w') as f:
         json.dump(test_config, f, indent=2)
     
-    # Run backtest
+    # Run the engine directly: the worker imports pandas/backtest once and
+    # skips the Monte Carlo, walk-forward and report files a full
+    # backtest.py run would produce but this comparison never reads
     try:
-        result = subprocess.run(
-            ['python', 'backtest.py', '--config', temp_config, '--data', 'data.csv'],
-            capture_output=True,
-            text=True,
-            timeout=600
-        )
-        
-        # Extract key metrics from output
-        output = result.stdout + result.stderr
-        metrics = {}
-        
-        # Parse results
-        for line in output.split('\n'):
-            if 'Total Trades:' in line:
-                match = re.search(r'Total Trades:\s*(\d+)', line)
-                if match:
-                    metrics['total_trades'] = int(match.group(1))
-            elif 'Win Rate:' in line:
-                match = re.search(r'Win Rate:\s*([\d.]+)%', line)
-                if match:
-                    metrics['win_rate'] = float(match.group(1))
-            elif 'Total P&L:' in line:
-                match = re.search(r'Total P&L:\s*\$?([\d,.-]+)', line)
-                if match:
-                    metrics['total_pnl'] = float(match.group(1).replace(',', ''))
-            elif 'Profit Factor:' in line:
-                match = re.search(r'Profit Factor:\s*([\d.]+)', line)
-                if match:
-                    metrics['profit_factor'] = float(match.group(1))
-            elif 'Max Drawdown:' in line:
-                match = re.search(r'Max Drawdown:\s*\$?([\d,.-]+)', line)
-                if match:
-                    metrics['max_drawdown'] = float(match.group(1).replace(',', ''))
-            elif 'Avg P&L/Trade:' in line:
-                match = re.search(r'Avg P&L/Trade:\s*\$?([\d,.-]+)', line)
-                if match:
-                    metrics['avg_pnl_per_trade'] = float(match.group(1).replace(',', ''))
+        # Silence the engine's progress output so parallel runs don't
+        # interleave it on the terminal
+        with open(os.devnull, 'w') as devnull, \
+                contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            engine = BacktestEngine(config_path=temp_config)
+            engine.load_data('data.csv')
+            engine.load_blackout_dates('blackout_dates.csv')
+            trade_results = engine.run()
+            metrics = engine.report_generator.calculate_metrics(trade_results)
         
-        results.append({
+        return index, {
             'scenario': scenario['name'],
             'description': scenario['description'],
-            'metrics': metrics
-        })
-        
-        print(f"OK Completed: {scenario['name']}")
-        if metrics:
-            print(f"  Trades: {metrics.get('total_trades', 'N/A')}")
-            print(f"  Win Rate: {metrics.get('win_rate', 'N/A')}%")
-            print(f"  Total P&L: ${metrics.get('total_pnl', 'N/A'):,.2f}")
-            print(f"  Profit Factor: {metrics.get('profit_factor', 'N/A')}")
-            print(f"  Max Drawdown: ${metrics.get('max_drawdown', 'N/A'):,.2f}")
-        
-    except subprocess.TimeoutExpired:
-        print(f"X Timeout: {scenario['name']}")
-        results.append({
-            'scenario': scenario['name'],
-            'description': scenario['description'],
-            'error': 'Timeout'
-        })
+            'metrics': summary_metrics(metrics)
+        }
     except Exception as e:
-        print(f"X Error: {e}")
-        results.append({
+        return index, {
             'scenario': scenario['name'],
             'description': scenario['description'],
             'error': str(e)
-        })
+        }
+    finally:
+        # Clean up
+        Path(temp_config).unlink(missing_ok=True)
+
+
+def print_scenario_result(r: dict) -> None:
+    print(f"\n{'='*70}")
+    print(f"Tested: {r['description']} ({r['scenario']})")
+    print(f"{'='*70}")
     
-    # Clean up
-    Path(temp_config).unlink(missing_ok=True)
+    if 'error' in r:
+        print(f"X Error: {r['error']}")
+        return
+    
+    metrics = r['metrics']
+    print(f"OK Completed: {r['scenario']}")
+    if metrics:
+        print(f"  Trades: {metrics.get('total_trades', 'N/A')}")
+        print(f"  Win Rate: {metrics.get('win_rate', 'N/A')}%")
+        print(f"  Total P&L: ${metrics.get('total_pnl', 'N/A'):,.2f}")
+        print(f"  Profit Factor: {metrics.get('profit_factor', 'N/A')}")
+        print(f"  Max Drawdown: ${metrics.get('max_drawdown', 'N/A'):,.2f}")
 
-# Print comparison
-print(f"\n{'='*100}")
-print("CONFIRMATION METHOD COMPARISON")
-print(f"{'='*100}")
 
-if results:
-    print(f"\n{'Scenario':<25} {'Trades':<10} {'Win Rate':<12} {'Total P&L':<15} {'Avg P&L':<15} {'Profit Factor':<15} {'Max DD':<15}")
-    print("-" * 110)
+def main():
+    # Load base config
+    with open('config.json', 'r') as f:
+        base_config = json.load(f)
     
-    for r in results:
-        if 'metrics' in r:
-            m = r['metrics']
-            desc = r['description'][:24]
-            print(f"{desc:<25} {m.get('total_trades', 'N/A'):<10} {m.get('win_rate', 'N/A'):<11.1f}% ${m.get('total_pnl', 0):<14,.2f} ${m.get('avg_pnl_per_trade', 0):<14,.2f} {m.get('profit_factor', 'N/A'):<15.2f} ${m.get('max_drawdown', 0):<14,.2f}")
-        else:
-            print(f"{r['description'][:24]:<25} ERROR: {r.get('error', 'Unknown')}")
-
-# Find best scenarios
-if results and all('metrics' in r for r in results if 'error' not in r):
-    valid_results = [r for r in results if 'metrics' in r]
+    # Scenarios are independent backtests, so run them side by side and
+    # report each one as soon as it finishes
+    jobs = [(i, scenario, base_config) for i, scenario in enumerate(scenarios)]
+    results = [None] * len(jobs)
     
-    if valid_results:
-        best_pnl = max(r['metrics'].get('total_pnl', 0) for r in valid_results)
-        best_pf = max(r['metrics'].get('profit_factor', 0) for r in valid_results)
-        best_wr = max(r['metrics'].get('win_rate', 0) for r in valid_results)
-        lowest_dd = min(r['metrics'].get('max_drawdown', 0) for r in valid_results)
-        
-        print(f"\n{'='*100}")
-        print("BEST PERFORMERS:")
-        print(f"{'='*100}")
-        
-        for r in valid_results:
-            m = r['metrics']
-            highlights = []
-            if m.get('total_pnl', 0) == best_pnl:
-                highlights.append("BEST P&L")
-            if m.get('profit_factor', 0) == best_pf:
-                highlights.append("BEST PF")
-            if m.get('win_rate', 0) == best_wr:
-                highlights.append("BEST WR")
-            if m.get('max_drawdown', 0) == lowest_dd:
-                highlights.append("LOWEST DD")
-            
-            if highlights:
-                print(f"{r['description']}: {' | '.join(highlights)}")
-
-# Save results to file
-with open('confirmation_comparison_results.txt', 'w') as f:
-    f.write("CONFIRMATION METHOD COMPARISON RESULTS\n")
-    f.write("=" * 100 + "\n\n")
+    with mp.Pool(min(len(jobs), mp.cpu_count())) as pool:
+        pending = pool.imap_unordered(run_scenario, jobs)
+        for _ in jobs:
+            try:
+                index, r = pending.next(timeout=SCENARIO_TIMEOUT)
+            except mp.TimeoutError:
+                # Leaving the with block terminates the hung workers
+                for index, scenario in enumerate(scenarios):
+                    if results[index] is None:
+                        results[index] = {
+                            'scenario': scenario['name'],
+                            'description': scenario['description'],
+                            'error': 'Timeout'
+                        }
+                        print_scenario_result(results[index])
+                        Path(f"config_{scenario['name']}.json").unlink(missing_ok=True)
+                break
+            results[index] = r
+            print_scenario_result(r)
     
-    for r in results:
-        f.write(f"{r['description']} ({r['scenario']})\n")
-        f.write("-" * 100 + "\n")
-        if 'metrics' in r:
-            m = r['metrics']
-            f.write(f"Total Trades: {m.get('total_trades', 'N/A')}\n")
-            f.write(f"Win Rate: {m.get('win_rate', 'N/A')}%\n")
-            f.write(f"Total P&L: ${m.get('total_pnl', 0):,.2f}\n")
-            f.write(f"Avg P&L/Trade: ${m.get('avg_pnl_per_trade', 0):,.2f}\n")
-            f.write(f"Profit Factor: {m.get('profit_factor', 'N/A')}\n")
-            f.write(f"Max Drawdown: ${m.get('max_drawdown', 0):,.2f}\n")
-        else:
-            f.write(f"Error: {r.get('error', 'Unknown')}\n")
-        f.write("\n")
-
-print(f"\n{'='*100}")
-print("Results saved to: confirmation_comparison_results.txt")
-print(f"{'='*100}")
+    # Print comparison
+    print(f"\n{'='*100}")
+    print("CONFIRMATION METHOD COMPARISON")
+    print(f"{'='*100}")
+
+    if results:
+        print(f"\n{'Scenario':<25} {'Trades':<10} {'Win Rate':<12} {'Total P&L':<15} {'Avg P&L':<15} {'Profit Factor':<15} {'Max DD':<15}")
+        print("-" * 110)
+
+        for r in results:
+            if 'metrics' in r:
+                m = r['metrics']
+                desc = r['description'][:24]
+                print(f"{desc:<25} {m.get('total_trades', 'N/A'):<10} {m.get('win_rate', 'N/A'):<11.1f}% ${m.get('total_pnl', 0):<14,.2f} ${m.get('avg_pnl_per_trade', 0):<14,.2f} {m.get('profit_factor', 'N/A'):<15.2f} ${m.get('max_drawdown', 0):<14,.2f}")
+            else:
+                print(f"{r['description'][:24]:<25} ERROR: {r.get('error', 'Unknown')}")
+
+    # Find best scenarios
+    if results and all('metrics' in r for r in results if 'error' not in r):
+        valid_results = [r for r in results if 'metrics' in r]
+
+        if valid_results:
+            best_pnl = max(r['metrics'].get('total_pnl', 0) for r in valid_results)
+            best_pf = max(r['metrics'].get('profit_factor', 0) for r in valid_results)
+            best_wr = max(r['metrics'].get('win_rate', 0) for r in valid_results)
+            lowest_dd = min(r['metrics'].get('max_drawdown', 0) for r in valid_results)
+
+            print(f"\n{'='*100}")
+            print("BEST PERFORMERS:")
+            print(f"{'='*100}")
+
+            for r in valid_results:
+                m = r['metrics']
+                highlights = []
+                if m.get('total_pnl', 0) == best_pnl:
+                    highlights.append("BEST P&L")
+                if m.get('profit_factor', 0) == best_pf:
+                    highlights.append("BEST PF")
+                if m.get('win_rate', 0) == best_wr:
+                    highlights.append("BEST WR")
+                if m.get('max_drawdown', 0) == lowest_dd:
+                    highlights.append("LOWEST DD")
+
+                if highlights:
+                    print(f"{r['description']}: {' | '.join(highlights)}")
+
+    # Save results to file
+    with open('confirmation_comparison_results.txt', 'w') as f:
+        f.write("CONFIRMATION METHOD COMPARISON RESULTS\n")
+        f.write("=" * 100 + "\n\n")
+
+        for r in results:
+            f.write(f"{r['description']} ({r['scenario']})\n")
+            f.write("-" * 100 + "\n")
+            if 'metrics' in r:
+                m = r['metrics']
+                f.write(f"Total Trades: {m.get('total_trades', 'N/A')}\n")
+                f.write(f"Win Rate: {m.get('win_rate', 'N/A')}%\n")
+                f.write(f"Total P&L: ${m.get('total_pnl', 0):,.2f}\n")
+                f.write(f"Avg P&L/Trade: ${m.get('avg_pnl_per_trade', 0):,.2f}\n")
+                f.write(f"Profit Factor: {m.get('profit_factor', 'N/A')}\n")
+                f.write(f"Max Drawdown: ${m.get('max_drawdown', 0):,.2f}\n")
+            else:
+                f.write(f"Error: {r.get('error', 'Unknown')}\n")
+            f.write("\n")
+
+    print(f"\n{'='*100}")
+    print("Results saved to: confirmation_comparison_results.txt")
+    print(f"{'='*100}")
+
 
+if __name__ == '__main__':
+    main()
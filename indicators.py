@@ -205,6 +205,22 @@ class Indicators:
         
         return int(sign_changes)
     
+    def vwap_cross_counts(
+        self,
+        df: pd.DataFrame,
+        vwap: pd.Series
+    ) -> np.ndarray:
+        """
+        Running count of close/VWAP sign changes up to each bar.
+        count_vwap_crosses(df, vwap, n, i) == counts[i] - counts[max(0, i - n)].
+        """
+        diff = df['close'].to_numpy() - vwap.to_numpy()
+        
+        counts = np.zeros(len(diff), dtype=np.int64)
+        np.cumsum(np.diff(np.sign(diff)) != 0, out=counts[1:])
+        
+        return counts
+    
     def is_rejection_candle(
         self,
         bar: pd.Series,
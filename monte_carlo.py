@@ -62,21 +62,22 @@ class MonteCarloSimulator:
         
         final_pnls = []
         max_drawdowns = []
-        equity_curves = []
+        
+        # Reused across iterations; index 0 holds the starting equity of 0
+        equity = np.zeros(len(pnls) + 1, dtype=np.float64)
+        running_max = np.empty_like(equity)
         
         np.random.seed(42)
         
         for _ in range(self.iterations):
             shuffled_pnls = np.random.permutation(pnls)
             
-            equity_curve = np.cumsum(shuffled_pnls)
-            equity_curves.append(equity_curve)
+            np.cumsum(shuffled_pnls, out=equity[1:])
             
-            final_pnls.append(equity_curve[-1])
+            final_pnls.append(equity[-1])
             
-            running_max = np.maximum.accumulate(np.concatenate([[0], equity_curve]))
-            drawdown = running_max[1:] - equity_curve
-            max_dd = np.max(drawdown) if len(drawdown) > 0 else 0
+            np.maximum.accumulate(equity, out=running_max)
+            max_dd = np.max(running_max[1:] - equity[1:])
             max_drawdowns.append(max_dd)
         
         final_pnls = np.array(final_pnls)
@@ -175,14 +176,11 @@ class MonteCarloSimulator:
         pnls = np.array([t.total_pnl for t in trade_results])
         n_trades = len(pnls)
         
-        all_paths = []
+        paths_array = np.zeros((num_paths, n_trades + 1), dtype=np.float64)
         
-        for _ in range(num_paths):
+        for i in range(num_paths):
             shuffled = np.random.permutation(pnls)
-            path = np.concatenate([[0], np.cumsum(shuffled)])
-            all_paths.append(path.tolist())
-        
-        paths_array = np.array(all_paths)
+            np.cumsum(shuffled, out=paths_array[i, 1:])
         
         percentiles = {
             '5th': np.percentile(paths_array, 5, axis=0).tolist(),
@@ -193,7 +191,7 @@ class MonteCarloSimulator:
         }
         
         return {
-            'paths': all_paths[:10],
+            'paths': paths_array[:10].tolist(),
             'percentiles': percentiles
         }
     
@@ -1,7 +1,48 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict
-from collections import defaultdict
+from typing import List, Dict, Tuple
+from operator import attrgetter
+
+TRADE_COLUMNS = (
+    'trade_id',
+    'side',
+    'session',
+    'entry_time',
+    'entry_price',
+    'stop_loss',
+    'take_profit',
+    'zone_confidence',
+    'confirmation_type',
+    'partial_exit_time',
+    'partial_exit_price',
+    'partial_pnl',
+    'final_exit_time',
+    'final_exit_price',
+    'final_pnl',
+    'total_pnl',
+    'result_ticks',
+    'break_even_triggered',
+    'exit_reason',
+    'cooldown_active'
+)
+
+_trade_row = attrgetter(*TRADE_COLUMNS)
+
+def equity_drawdown(pnls: np.ndarray) -> Tuple[float, float, int, int]:
+    """Return (final equity, max drawdown, peak index, trough index).
+    
+    Indices refer to the equity curve, which starts at 0 before the first
+    trade, so index i is the equity after trade i.
+    """
+    equity = np.empty(len(pnls) + 1, dtype=np.float64)
+    equity[0] = 0.0
+    np.cumsum(pnls, out=equity[1:])
+    # Running max, then drawdown, in the same buffer
+    drawdown = np.maximum.accumulate(equity)
+    np.subtract(drawdown, equity, out=drawdown)
+    trough_idx = int(np.argmax(drawdown))
+    peak_idx = int(np.argmax(equity[:trough_idx + 1]))
+    return float(equity[-1]), float(drawdown[trough_idx]), peak_idx, trough_idx
 
 
 class ReportGenerator:
@@ -9,58 +50,66 @@ class ReportGenerator:
         self.config = config
         self.tick_size = config.get('tick_size', 0.10)
         self.tick_value = config.get('tick_value', 1.00)
+        self._cache = None
         
     def results_to_dataframe(self, trade_results: List) -> pd.DataFrame:
         if not trade_results:
             return pd.DataFrame()
         
-        records = []
-        for t in trade_results:
-            records.append({
-                'trade_id': t.trade_id,
-                'side': t.side,
-                'session': t.session,
-                'entry_time': t.entry_time,
-                'entry_price': t.entry_price,
-                'stop_loss': t.stop_loss,
-                'take_profit': t.take_profit,
-                'zone_confidence': t.zone_confidence,
-                'confirmation_type': t.confirmation_type,
-                'partial_exit_time': t.partial_exit_time,
-                'partial_exit_price': t.partial_exit_price,
-                'partial_pnl': t.partial_pnl,
-                'final_exit_time': t.final_exit_time,
-                'final_exit_price': t.final_exit_price,
-                'final_pnl': t.final_pnl,
-                'total_pnl': t.total_pnl,
-                'result_ticks': t.result_ticks,
-                'break_even_triggered': t.break_even_triggered,
-                'exit_reason': t.exit_reason,
-                'cooldown_active': t.cooldown_active
-            })
-        
-        return pd.DataFrame(records)
+        # Transpose the trades into one tuple per column so the frame is
+        # built column-wise instead of from a dict per trade
+        columns = zip(*map(_trade_row, trade_results))
+        return pd.DataFrame(dict(zip(TRADE_COLUMNS, columns)))
+    
+    def _to_arrays(self, trade_results: List) -> Dict[str, np.ndarray]:
+        # One pass over the trade objects; the metrics work on these columns
+        n = len(trade_results)
+        return {
+            'total_pnl': np.fromiter((t.total_pnl for t in trade_results), dtype=float, count=n),
+            'is_long': np.fromiter((t.side == 'long' for t in trade_results), dtype=bool, count=n),
+            'zone_confidence': np.fromiter((t.zone_confidence for t in trade_results), dtype=float, count=n),
+            'break_even_triggered': np.fromiter((t.break_even_triggered for t in trade_results), dtype=bool, count=n),
+            'has_partial': np.fromiter((t.partial_exit_time is not None for t in trade_results), dtype=bool, count=n),
+            'partial_pnl': np.fromiter((t.partial_pnl for t in trade_results), dtype=float, count=n),
+            'cooldown_active': np.fromiter((t.cooldown_active for t in trade_results), dtype=bool, count=n)
+        }
+    
+    def prepare(self, trade_results: List) -> Tuple[Dict[str, np.ndarray], pd.DataFrame]:
+        # Cached against the list object and its length: reporting the same
+        # results again reuses them, appending to the list rebuilds them.
+        # The returned DataFrame is shared, so treat it as read-only.
+        cache = self._cache
+        if cache is None or cache[0] is not trade_results or cache[1] != len(trade_results):
+            arrays = self._to_arrays(trade_results)
+            df = self.results_to_dataframe(trade_results)
+            if len(df):
+                # Wall-clock hour in the trades' own timezone, in one vectorized pass
+                arrays['entry_hour'] = df['entry_time'].dt.hour.to_numpy()
+            cache = (trade_results, len(trade_results), arrays, df)
+            self._cache = cache
+        return cache[2], cache[3]
     
     def calculate_metrics(self, trade_results: List) -> dict:
         if not trade_results:
             return self._empty_metrics()
         
-        pnls = [t.total_pnl for t in trade_results]
-        total_trades = len(trade_results)
+        arrays, df = self.prepare(trade_results)
+        pnls = arrays['total_pnl']
+        total_trades = len(pnls)
         
-        wins = [p for p in pnls if p > 0]
-        losses = [p for p in pnls if p < 0]
-        breakeven = [p for p in pnls if p == 0]
+        wins = pnls[pnls > 0]
+        losses = pnls[pnls < 0]
+        breakeven_count = int((pnls == 0).sum())
         
-        total_pnl = sum(pnls)
-        win_rate = len(wins) / total_trades if total_trades > 0 else 0
-        avg_pnl = total_pnl / total_trades if total_trades > 0 else 0
+        total_pnl = float(pnls.sum())
+        win_rate = len(wins) / total_trades
+        avg_pnl = total_pnl / total_trades
         
-        avg_win = sum(wins) / len(wins) if wins else 0
-        avg_loss = sum(losses) / len(losses) if losses else 0
+        gross_profit = float(wins.sum())
+        gross_loss = abs(float(losses.sum()))
         
-        gross_profit = sum(wins) if wins else 0
-        gross_loss = abs(sum(losses)) if losses else 0
+        avg_win = gross_profit / len(wins) if len(wins) else 0
+        avg_loss = -gross_loss / len(losses) if len(losses) else 0
         
         if gross_loss > 0:
             profit_factor = gross_profit / gross_loss
@@ -69,30 +118,22 @@ class ReportGenerator:
         else:
             profit_factor = 0
         
-        equity = [0]
-        for pnl in pnls:
-            equity.append(equity[-1] + pnl)
-        
-        equity = np.array(equity)
-        running_max = np.maximum.accumulate(equity)
-        drawdown = running_max - equity
-        max_drawdown = float(np.max(drawdown))
+        _, max_drawdown, peak_idx, max_dd_idx = equity_drawdown(pnls)
         
-        max_dd_idx = np.argmax(drawdown)
-        peak_idx = np.argmax(equity[:max_dd_idx + 1]) if max_dd_idx > 0 else 0
+        df = df.assign(win=pnls > 0)
         
-        session_breakdown = self._calculate_session_breakdown(trade_results)
-        hour_breakdown = self._calculate_hour_breakdown(trade_results)
-        enhancement_impact = self._calculate_enhancement_impact(trade_results)
+        session_breakdown = self._calculate_session_breakdown(df)
+        hour_breakdown = self._calculate_hour_breakdown(arrays)
+        enhancement_impact = self._calculate_enhancement_impact(arrays)
         
-        long_trades = [t for t in trade_results if t.side == 'long']
-        short_trades = [t for t in trade_results if t.side == 'short']
+        is_long = arrays['is_long']
+        long_count = int(is_long.sum())
         
         return {
             'total_trades': total_trades,
             'winning_trades': len(wins),
             'losing_trades': len(losses),
-            'breakeven_trades': len(breakeven),
+            'breakeven_trades': breakeven_count,
             'win_rate': round(win_rate, 4),
             'total_pnl': round(total_pnl, 2),
             'gross_profit': round(gross_profit, 2),
@@ -102,94 +143,103 @@ class ReportGenerator:
             'avg_loss': round(avg_loss, 2),
             'profit_factor': round(min(profit_factor, 100), 2),
             'max_drawdown': round(max_drawdown, 2),
-            'max_drawdown_trades': max_dd_idx - peak_idx if max_dd_idx > peak_idx else 0,
-            'long_trades': len(long_trades),
-            'short_trades': len(short_trades),
-            'long_pnl': round(sum(t.total_pnl for t in long_trades), 2),
-            'short_pnl': round(sum(t.total_pnl for t in short_trades), 2),
+            'max_drawdown_trades': max_dd_idx - peak_idx,
+            'long_trades': long_count,
+            'short_trades': total_trades - long_count,
+            'long_pnl': round(float(pnls[is_long].sum()), 2),
+            'short_pnl': round(float(pnls[~is_long].sum()), 2),
             'session_breakdown': session_breakdown,
             'hour_breakdown': hour_breakdown,
             'enhancement_impact': enhancement_impact
         }
     
-    def _calculate_session_breakdown(self, trade_results: List) -> dict:
-        sessions = defaultdict(list)
-        
-        for t in trade_results:
-            sessions[t.session].append(t)
+    def _calculate_session_breakdown(self, df: pd.DataFrame) -> dict:
+        # dropna=False keeps trades without a session; their group key comes
+        # back as NaN and is reported under None as before
+        sessions = df.groupby('session', sort=False, dropna=False).agg(
+            trades=('total_pnl', 'size'),
+            pnl=('total_pnl', 'sum'),
+            wins=('win', 'sum')
+        )
         
         breakdown = {}
-        for session, trades in sessions.items():
-            pnls = [t.total_pnl for t in trades]
-            wins = [p for p in pnls if p > 0]
-            
-            breakdown[session] = {
-                'trades': len(trades),
-                'pnl': round(sum(pnls), 2),
-                'win_rate': round(len(wins) / len(pnls), 4) if pnls else 0,
-                'avg_pnl': round(sum(pnls) / len(pnls), 2) if pnls else 0
+        for session, trades, pnl, wins in sessions.itertuples():
+            breakdown[None if pd.isna(session) else session] = {
+                'trades': int(trades),
+                'pnl': round(float(pnl), 2),
+                'win_rate': round(int(wins) / trades, 4),
+                'avg_pnl': round(float(pnl) / trades, 2)
             }
         
         return breakdown
     
-    def _calculate_hour_breakdown(self, trade_results: List) -> dict:
-        hours = defaultdict(list)
+    def _calculate_hour_breakdown(self, arrays: Dict[str, np.ndarray]) -> dict:
+        hours = arrays['entry_hour']
+        pnls = arrays['total_pnl']
         
-        for t in trade_results:
-            hour = t.entry_time.hour
-            hours[hour].append(t)
+        counts = np.bincount(hours, minlength=24)
+        pnl_sums = np.bincount(hours, weights=pnls, minlength=24)
+        win_counts = np.bincount(hours, weights=pnls > 0, minlength=24)
         
         breakdown = {}
-        for hour, trades in sorted(hours.items()):
-            pnls = [t.total_pnl for t in trades]
-            wins = [p for p in pnls if p > 0]
-            
+        for hour in np.flatnonzero(counts):
+            trades = int(counts[hour])
             breakdown[str(hour)] = {
-                'trades': len(trades),
-                'pnl': round(sum(pnls), 2),
-                'win_rate': round(len(wins) / len(pnls), 4) if pnls else 0
+                'trades': trades,
+                'pnl': round(float(pnl_sums[hour]), 2),
+                'win_rate': round(int(win_counts[hour]) / trades, 4)
             }
         
         return breakdown
     
-    def _calculate_enhancement_impact(self, trade_results: List) -> dict:
-        be_triggered = [t for t in trade_results if t.break_even_triggered]
-        be_not_triggered = [t for t in trade_results if not t.break_even_triggered]
-        
-        be_wins_preserved = len([t for t in be_triggered if t.total_pnl >= 0])
-        
-        partial_trades = [t for t in trade_results if t.partial_exit_time is not None]
-        partial_pnl = sum(t.partial_pnl for t in partial_trades)
-        
-        cooldown_trades = [t for t in trade_results if t.cooldown_active]
-        non_cooldown_trades = [t for t in trade_results if not t.cooldown_active]
-        
-        high_conf_trades = [t for t in trade_results if t.zone_confidence >= 0.75]
-        low_conf_trades = [t for t in trade_results if t.zone_confidence < 0.75]
+    def _calculate_enhancement_impact(self, arrays: Dict[str, np.ndarray]) -> dict:
+        pnls = arrays['total_pnl']
+        n = len(pnls)
+        be_mask = arrays['break_even_triggered']
+        partial_mask = arrays['has_partial']
+        partial_pnls = arrays['partial_pnl']
+        cooldown_mask = arrays['cooldown_active']
+        
+        be_pnls = pnls[be_mask]
+        no_be_pnls = pnls[~be_mask]
+        
+        partial_count = int(partial_mask.sum())
+        partial_pnl = float(partial_pnls[partial_mask].sum())
+        
+        cooldown_count = int(cooldown_mask.sum())
+        
+        confidence = arrays['zone_confidence']
+        win_mask = pnls > 0
+        high_conf_mask = confidence >= 0.75
+        low_conf_mask = confidence < 0.75
+        high_conf_count = int(high_conf_mask.sum())
+        low_conf_count = int(low_conf_mask.sum())
+        high_conf_wins = int((win_mask & high_conf_mask).sum())
+        low_conf_wins = int((win_mask & low_conf_mask).sum())
         
         return {
             'break_even': {
-                'triggered_count': len(be_triggered),
-                'wins_preserved': be_wins_preserved,
-                'avg_pnl_with_be': round(np.mean([t.total_pnl for t in be_triggered]), 2) if be_triggered else 0,
-                'avg_pnl_without_be': round(np.mean([t.total_pnl for t in be_not_triggered]), 2) if be_not_triggered else 0
+                'triggered_count': len(be_pnls),
+                'wins_preserved': int((be_pnls >= 0).sum()),
+                'avg_pnl_with_be': round(be_pnls.mean(), 2) if len(be_pnls) else 0,
+                'avg_pnl_without_be': round(no_be_pnls.mean(), 2) if len(no_be_pnls) else 0
             },
             'partial_profits': {
-                'trades_with_partial': len(partial_trades),
+                'trades_with_partial': partial_count,
                 'partial_pnl_captured': round(partial_pnl, 2),
-                'avg_partial_pnl': round(partial_pnl / len(partial_trades), 2) if partial_trades else 0
+                'avg_partial_pnl': round(partial_pnl / partial_count, 2) if partial_count else 0
             },
             'cooldown': {
-                'trades_during_cooldown': len(cooldown_trades),
-                'trades_normal': len(non_cooldown_trades),
-                'pnl_during_cooldown': round(sum(t.total_pnl for t in cooldown_trades), 2),
-                'pnl_normal': round(sum(t.total_pnl for t in non_cooldown_trades), 2)
+                'trades_during_cooldown': cooldown_count,
+                'trades_normal': n - cooldown_count,
+                'pnl_during_cooldown': round(float(pnls[cooldown_mask].sum()), 2),
+                'pnl_normal': round(float(pnls[~cooldown_mask].sum()), 2)
             },
             'zone_confidence': {
-                'high_conf_trades': len(high_conf_trades),
-                'high_conf_win_rate': round(len([t for t in high_conf_trades if t.total_pnl > 0]) / len(high_conf_trades), 4) if high_conf_trades else 0,
-                'low_conf_trades': len(low_conf_trades),
-                'low_conf_win_rate': round(len([t for t in low_conf_trades if t.total_pnl > 0]) / len(low_conf_trades), 4) if low_conf_trades else 0
+                'high_conf_trades': high_conf_count,
+                'high_conf_win_rate': round(high_conf_wins / high_conf_count, 4) if high_conf_count else 0,
+                'low_conf_trades': low_conf_count,
+                'low_conf_win_rate': round(low_conf_wins / low_conf_count, 4) if low_conf_count else 0
             }
         }
     
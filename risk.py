@@ -1,7 +1,10 @@
+import numpy as np
 import pandas as pd
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Tuple, Dict, NamedTuple, Deque
 from enum import Enum
+from datetime import date
 
 
 class PositionStatus(Enum):
@@ -10,7 +13,15 @@ class PositionStatus(Enum):
     CLOSED = 'closed'
 
 
-@dataclass
+class Bar(NamedTuple):
+    """Per-bar prices RiskManager needs, read from the DataFrame columns."""
+    timestamp: pd.Timestamp
+    high: float
+    low: float
+    close: float
+
+
+@dataclass(slots=True)
 class Position:
     trade_id: int
     side: str
@@ -39,8 +50,17 @@ class Position:
     final_pnl: float = 0.0
     total_pnl: float = 0.0
     exit_reason: str = ''
-    structure_levels: List[float] = field(default_factory=list)
+    structure_levels: Deque[float] = field(default_factory=deque)
     last_broken_level: Optional[float] = None
+    # +1.0 for longs, -1.0 for shorts
+    side_sign: float = 1.0
+    # Per-trade constants derived from entry and initial stop in open_position
+    risk: float = 0.0
+    partial_trigger_price: float = 0.0
+    break_even_trigger_price: float = 0.0
+    trail_activation_distance: float = 0.0
+    trail_distance: float = 0.0
+    entry_date: Optional[date] = None
 
 
 @dataclass
@@ -61,7 +81,7 @@ class PendingLimitOrder:
     timestamp: pd.Timestamp
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeResult:
     trade_id: int
     side: str
@@ -91,7 +111,10 @@ class RiskManager:
         self.tick_size = config.get('tick_size', 0.10)
         self.tick_value = config.get('tick_value', 1.00)
         self.commission_per_contract = config.get('commission_per_contract', 0.62)
+        self.commission_round_trip = self.commission_per_contract * 2
         self.slippage_ticks = config.get('slippage_ticks', 1)
+        # Price slippage applied against every exit fill
+        self.slippage = self.slippage_ticks * self.tick_size
         self.position_size = config.get('position_size_contracts', 1)
         
         be_config = config.get('break_even', {})
@@ -183,7 +206,7 @@ class RiskManager:
     
     def check_pending_orders(
         self,
-        bar: pd.Series,
+        bar: Bar,
         bar_index: int,
         date
     ) -> Optional[Position]:
@@ -191,37 +214,32 @@ class RiskManager:
         if not self.pending_orders:
             return None
         
-        high = bar['high']
-        low = bar['low']
-        timestamp = pd.Timestamp(bar['timestamp'])
+        high = bar.high
+        low = bar.low
         
-        orders_to_remove = []
-        filled_position = None
+        expired = []
         
         for order_id, order in self.pending_orders.items():
             # Check if order has expired
             bars_elapsed = bar_index - order.created_bar
             if bars_elapsed > order.max_wait_bars:
-                orders_to_remove.append(order_id)
+                expired.append(order_id)
                 continue
             
             # Check if limit price was touched
-            filled = False
             if order.side == 'long':
                 # For long, price needs to come down to our limit
-                if low <= order.limit_price:
-                    filled = True
+                filled = low <= order.limit_price
             else:  # short
                 # For short, price needs to come up to our limit
-                if high >= order.limit_price:
-                    filled = True
+                filled = high >= order.limit_price
             
             if filled:
                 # Open position from the limit order
                 filled_position = self.open_position(
                     side=order.side,
                     entry_price=order.limit_price,
-                    entry_time=timestamp,
+                    entry_time=bar.timestamp,
                     entry_index=bar_index,
                     stop_loss=order.stop_loss,
                     take_profit=order.take_profit,
@@ -232,17 +250,14 @@ class RiskManager:
                     reward_ticks=order.reward_ticks,
                     structure_levels=order.structure_levels
                 )
-                orders_to_remove.append(order_id)
-                # Cancel all other pending orders when one fills
-                orders_to_remove.extend([oid for oid in self.pending_orders.keys() if oid != order_id])
-                break
+                # A fill cancels every other pending order, expired or not
+                self.pending_orders.clear()
+                return filled_position
         
-        # Remove filled/expired orders
-        for order_id in orders_to_remove:
-            if order_id in self.pending_orders:
-                del self.pending_orders[order_id]
+        for order_id in expired:
+            del self.pending_orders[order_id]
         
-        return filled_position
+        return None
     
     def has_pending_orders(self) -> bool:
         return len(self.pending_orders) > 0
@@ -281,15 +296,11 @@ class RiskManager:
         
         pos = self.current_position
         
-        if pos.side == 'long':
-            pnl_ticks = (current_price - pos.entry_price) / self.tick_size
-        else:
-            pnl_ticks = (pos.entry_price - current_price) / self.tick_size
-        
-        gross_pnl = pnl_ticks * self.tick_value * pos.remaining_contracts
-        commission = self.commission_per_contract * pos.remaining_contracts * 2
-        
-        return gross_pnl - commission + pos.partial_pnl
+        return self._net_pnl(pos, current_price, pos.remaining_contracts) + pos.partial_pnl
+    
+    def _net_pnl(self, pos: Position, exit_price: float, contracts: int) -> float:
+        pnl_ticks = pos.side_sign * (exit_price - pos.entry_price) / self.tick_size
+        return pnl_ticks * self.tick_value * contracts - self.commission_round_trip * contracts
     
     def should_force_exit(self, date, current_price: float) -> bool:
         if self.current_position is None:
@@ -313,20 +324,10 @@ class RiskManager:
         
         pos = self.current_position
         
-        slippage = self.slippage_ticks * self.tick_size
-        if pos.side == 'long':
-            actual_exit = exit_price - slippage
-        else:
-            actual_exit = exit_price + slippage
-        
-        if pos.side == 'long':
-            pnl_ticks = (actual_exit - pos.entry_price) / self.tick_size
-        else:
-            pnl_ticks = (pos.entry_price - actual_exit) / self.tick_size
+        # Slippage always works against the position: down for longs, up for shorts
+        actual_exit = exit_price - pos.side_sign * self.slippage
         
-        gross_pnl = pnl_ticks * self.tick_value * pos.remaining_contracts
-        commission = self.commission_per_contract * pos.remaining_contracts * 2
-        net_pnl = gross_pnl - commission
+        net_pnl = self._net_pnl(pos, actual_exit, pos.remaining_contracts)
         
         pos.final_exit_time = timestamp
         pos.final_exit_price = actual_exit
@@ -335,7 +336,7 @@ class RiskManager:
         pos.exit_reason = 'hard_daily_stop'
         pos.status = PositionStatus.CLOSED
         
-        total_ticks = (pos.total_pnl + self.commission_per_contract * pos.contracts * 2) / (self.tick_value * pos.contracts)
+        total_ticks = (pos.total_pnl + self.commission_round_trip * pos.contracts) / (self.tick_value * pos.contracts)
         
         result = TradeResult(
             trade_id=pos.trade_id,
@@ -362,8 +363,8 @@ class RiskManager:
         
         self.trade_results.append(result)
         
-        date = pos.entry_time.date()
-        self.daily_pnl[date] = self.daily_pnl.get(date, 0.0) + pos.total_pnl
+        entry_date = pos.entry_date
+        self.daily_pnl[entry_date] = self.daily_pnl.get(entry_date, 0.0) + pos.total_pnl
         
         self.current_position = None
         
@@ -386,6 +387,13 @@ class RiskManager:
     ) -> Position:
         self.trade_counter += 1
         
+        # Only levels ahead of the entry matter to the position; keep them
+        # unique and nearest-first so a broken level is always popped from the left
+        if side == 'long':
+            levels_ahead = deque(sorted({l for l in structure_levels or [] if l > entry_price}))
+        else:
+            levels_ahead = deque(sorted({l for l in structure_levels or [] if l < entry_price}, reverse=True))
+        
         position = Position(
             trade_id=self.trade_counter,
             side=side,
@@ -402,29 +410,53 @@ class RiskManager:
             confirmation_type=confirmation_type,
             risk_ticks=risk_ticks,
             reward_ticks=reward_ticks,
-            structure_levels=structure_levels or []
+            structure_levels=levels_ahead,
+            side_sign=1.0 if side == 'long' else -1.0
         )
         
+        risk = abs(entry_price - stop_loss)
+        partial_trigger_distance = self.partial_exit_r * risk
+        position.risk = risk
+        be_trigger_distance = self.break_even_trigger_r * risk
+        if side == 'long':
+            position.partial_trigger_price = entry_price + partial_trigger_distance
+            be_trigger_price = entry_price + be_trigger_distance
+        else:
+            position.partial_trigger_price = entry_price - partial_trigger_distance
+            be_trigger_price = entry_price - be_trigger_distance
+        # Early (tick-based) and R-based BE move the stop the same way, so
+        # whichever threshold is closer to entry is the one that fires
+        if self.early_be_enabled:
+            early_be_distance = self.early_be_ticks * self.tick_size
+            if side == 'long':
+                be_trigger_price = min(be_trigger_price, entry_price + early_be_distance)
+            else:
+                be_trigger_price = max(be_trigger_price, entry_price - early_be_distance)
+        position.break_even_trigger_price = be_trigger_price
+        position.trail_activation_distance = self.trailing_activation_r * risk
+        position.trail_distance = self.trailing_distance_r * risk
+        
         self.current_position = position
         
-        date = entry_time.date()
-        self.daily_trades[date] = self.daily_trades.get(date, 0) + 1
+        entry_date = entry_time.date()
+        position.entry_date = entry_date
+        self.daily_trades[entry_date] = self.daily_trades.get(entry_date, 0) + 1
         
         return position
     
     def update_position(
         self,
-        bar: pd.Series,
+        bar: Bar,
         bar_index: int
     ) -> Tuple[Optional[TradeResult], bool]:
         if self.current_position is None:
             return None, False
         
         pos = self.current_position
-        high = bar['high']
-        low = bar['low']
-        close = bar['close']
-        timestamp = pd.Timestamp(bar['timestamp'])
+        high = bar.high
+        low = bar.low
+        close = bar.close
+        timestamp = bar.timestamp
         
         self._check_break_even(pos, high, low)
         
@@ -458,32 +490,24 @@ class RiskManager:
         # Use larger buffer to avoid liquidity sweep stop-outs
         buffer = self.liquidity_sweep_buffer_ticks * self.tick_size
         
+        level = pos.structure_levels[0]
+        
         if pos.side == 'long':
-            # Check if we broke through any supply zones (resistance becomes support)
-            for level in pos.structure_levels:
-                if level > pos.entry_price:
-                    # Price closed above this resistance level
-                    if low > level:  # Clean break - candle low is above level
-                        new_sl = level - buffer
-                        if new_sl > pos.current_stop_loss:
-                            pos.current_stop_loss = new_sl
-                            pos.last_broken_level = level
-                            # Remove this level from structure_levels
-                            pos.structure_levels = [l for l in pos.structure_levels if l != level]
-                        break  # Only check one level at a time
+            # Resistance becomes support once a candle's low clears it
+            if low > level:
+                new_sl = level - buffer
+                if new_sl > pos.current_stop_loss:
+                    pos.current_stop_loss = new_sl
+                    pos.last_broken_level = level
+                    pos.structure_levels.popleft()
         else:  # short
-            # Check if we broke through any demand zones (support becomes resistance)
-            for level in pos.structure_levels:
-                if level < pos.entry_price:
-                    # Price closed below this support level
-                    if high < level:  # Clean break - candle high is below level
-                        new_sl = level + buffer
-                        if new_sl < pos.current_stop_loss:
-                            pos.current_stop_loss = new_sl
-                            pos.last_broken_level = level
-                            # Remove this level from structure_levels
-                            pos.structure_levels = [l for l in pos.structure_levels if l != level]
-                        break  # Only check one level at a time
+            # Support becomes resistance once a candle's high clears it
+            if high < level:
+                new_sl = level + buffer
+                if new_sl < pos.current_stop_loss:
+                    pos.current_stop_loss = new_sl
+                    pos.last_broken_level = level
+                    pos.structure_levels.popleft()
 
     def _update_trailing_stop(
         self,
@@ -494,9 +518,8 @@ class RiskManager:
         if not self.trailing_enabled:
             return
         
-        risk = abs(pos.entry_price - pos.initial_stop_loss)
-        activation_distance = self.trailing_activation_r * risk
-        trail_distance = self.trailing_distance_r * risk
+        activation_distance = pos.trail_activation_distance
+        trail_distance = pos.trail_distance
         
         if pos.side == 'long':
             current_profit = high - pos.entry_price
@@ -523,38 +546,10 @@ class RiskManager:
         if pos.break_even_triggered:
             return
         
-        should_move = False
-        
-        # Early BE based on ticks (moves to BE when trade goes X ticks in profit)
-        if self.early_be_enabled:
-            early_be_distance = self.early_be_ticks * self.tick_size
-            
-            if pos.side == 'long':
-                # Check if we've reached the early BE threshold
-                if high >= pos.entry_price + early_be_distance:
-                    if pos.current_stop_loss < pos.entry_price:
-                        should_move = True
-            else:  # short
-                # Check if we've reached the early BE threshold
-                if low <= pos.entry_price - early_be_distance:
-                    if pos.current_stop_loss > pos.entry_price:
-                        should_move = True
-        
-        # R-based BE (original logic) - only if early BE didn't trigger
-        if not should_move:
-            risk = abs(pos.entry_price - pos.initial_stop_loss)
-            trigger_price_distance = self.break_even_trigger_r * risk
-            
-            if pos.side == 'long':
-                trigger_price = pos.entry_price + trigger_price_distance
-                if high >= trigger_price:
-                    if pos.current_stop_loss < pos.entry_price:
-                        should_move = True
-            else:
-                trigger_price = pos.entry_price - trigger_price_distance
-                if low <= trigger_price:
-                    if pos.current_stop_loss > pos.entry_price:
-                        should_move = True
+        if pos.side == 'long':
+            should_move = high >= pos.break_even_trigger_price and pos.current_stop_loss < pos.entry_price
+        else:
+            should_move = low <= pos.break_even_trigger_price and pos.current_stop_loss > pos.entry_price
         
         if should_move:
             pos.current_stop_loss = pos.entry_price
@@ -573,54 +568,37 @@ class RiskManager:
         if pos.partial_exit_done:
             return False
         
-        risk = abs(pos.entry_price - pos.initial_stop_loss)
-        
         # Structure-based partial: exit just before the next structure level
         if self.structure_based_partial and pos.structure_levels:
             buffer = self.structure_buffer_ticks * self.tick_size
             # Use 2x buffer to exit well before the structure level (more aggressive)
             aggressive_buffer = buffer * 2
             
+            # structure_levels holds only levels ahead of entry, nearest first
+            next_level = pos.structure_levels[0]
+            
             if pos.side == 'long':
-                # Find the closest structure level (supply zone) ahead
-                next_level = None
-                for level in pos.structure_levels:
-                    if level > pos.entry_price:
-                        next_level = level
-                        break
-                
-                if next_level:
-                    partial_price = next_level - aggressive_buffer
-                    if high >= partial_price:
-                        self._execute_partial_exit(pos, partial_price, timestamp)
-                        return True
+                partial_price = next_level - aggressive_buffer
+                if high >= partial_price:
+                    self._execute_partial_exit(pos, partial_price, timestamp)
+                    return True
             else:
-                # Find the closest structure level (demand zone) ahead
-                next_level = None
-                for level in pos.structure_levels:
-                    if level < pos.entry_price:
-                        next_level = level
-                        break
-                
-                if next_level:
-                    partial_price = next_level + aggressive_buffer
-                    if low <= partial_price:
-                        self._execute_partial_exit(pos, partial_price, timestamp)
-                        return True
+                partial_price = next_level + aggressive_buffer
+                if low <= partial_price:
+                    self._execute_partial_exit(pos, partial_price, timestamp)
+                    return True
         
         # Fallback to R-based partial if no structure levels
-        partial_trigger_distance = self.partial_exit_r * risk
+        partial_price = pos.partial_trigger_price
         
         if pos.side == 'long':
-            partial_price = pos.entry_price + partial_trigger_distance
-            if high >= partial_price:
-                self._execute_partial_exit(pos, partial_price, timestamp)
-                return True
+            triggered = high >= partial_price
         else:
-            partial_price = pos.entry_price - partial_trigger_distance
-            if low <= partial_price:
-                self._execute_partial_exit(pos, partial_price, timestamp)
-                return True
+            triggered = low <= partial_price
+        
+        if triggered:
+            self._execute_partial_exit(pos, partial_price, timestamp)
+            return True
         
         return False
     
@@ -630,24 +608,14 @@ class RiskManager:
         exit_price: float,
         timestamp: pd.Timestamp
     ) -> None:
-        slippage = self.slippage_ticks * self.tick_size
-        if pos.side == 'long':
-            actual_exit = exit_price - slippage
-        else:
-            actual_exit = exit_price + slippage
+        # Slippage always works against the position: down for longs, up for shorts
+        actual_exit = exit_price - pos.side_sign * self.slippage
         
         contracts_to_close = int(pos.contracts * self.partial_exit_pct)
         if contracts_to_close < 1:
             contracts_to_close = 1
         
-        if pos.side == 'long':
-            pnl_ticks = (actual_exit - pos.entry_price) / self.tick_size
-        else:
-            pnl_ticks = (pos.entry_price - actual_exit) / self.tick_size
-        
-        gross_pnl = pnl_ticks * self.tick_value * contracts_to_close
-        commission = self.commission_per_contract * contracts_to_close * 2
-        net_pnl = gross_pnl - commission
+        net_pnl = self._net_pnl(pos, actual_exit, contracts_to_close)
         
         pos.partial_exit_done = True
         pos.partial_exit_time = timestamp
@@ -657,8 +625,7 @@ class RiskManager:
         pos.status = PositionStatus.PARTIAL_CLOSED
         
         # Move SL to lock partial profit (configurable, default 0.5R gives room for retest)
-        risk = abs(pos.entry_price - pos.initial_stop_loss)
-        trailing_distance = self.post_partial_sl_lock_r * risk
+        trailing_distance = self.post_partial_sl_lock_r * pos.risk
         
         if pos.side == 'long':
             new_sl = pos.entry_price + trailing_distance
@@ -676,42 +643,27 @@ class RiskManager:
         timestamp: pd.Timestamp,
         bar_index: int
     ) -> Optional[TradeResult]:
-        sl_hit = False
-        tp_hit = False
-        
-        if pos.side == 'long':
-            sl_hit = low <= pos.current_stop_loss
-            tp_hit = high >= pos.take_profit
-        else:
-            sl_hit = high >= pos.current_stop_loss
-            tp_hit = low <= pos.take_profit
-        
-        if sl_hit and tp_hit:
+        # Scaling by the side sign flips a short's prices so one pair of
+        # comparisons covers both directions: the adverse extreme is the
+        # smaller scaled price, the favorable one the larger
+        sign = pos.side_sign
+        scaled_low = sign * low
+        scaled_high = sign * high
+        # When a bar spans both levels the stop is assumed to fill first,
+        # so the target is only checked once the stop has survived the bar
+        if min(scaled_low, scaled_high) <= sign * pos.current_stop_loss:
             exit_price = pos.current_stop_loss
             exit_reason = 'stop_loss'
-        elif sl_hit:
-            exit_price = pos.current_stop_loss
-            exit_reason = 'stop_loss'
-        elif tp_hit:
+        elif max(scaled_low, scaled_high) >= sign * pos.take_profit:
             exit_price = pos.take_profit
             exit_reason = 'take_profit'
         else:
             return None
         
-        slippage = self.slippage_ticks * self.tick_size
-        if pos.side == 'long':
-            actual_exit = exit_price - slippage if exit_reason == 'stop_loss' else exit_price - slippage
-        else:
-            actual_exit = exit_price + slippage if exit_reason == 'stop_loss' else exit_price + slippage
-        
-        if pos.side == 'long':
-            pnl_ticks = (actual_exit - pos.entry_price) / self.tick_size
-        else:
-            pnl_ticks = (pos.entry_price - actual_exit) / self.tick_size
+        # Slippage always works against the position: down for longs, up for shorts
+        actual_exit = exit_price - pos.side_sign * self.slippage
         
-        gross_pnl = pnl_ticks * self.tick_value * pos.remaining_contracts
-        commission = self.commission_per_contract * pos.remaining_contracts * 2
-        net_pnl = gross_pnl - commission
+        net_pnl = self._net_pnl(pos, actual_exit, pos.remaining_contracts)
         
         pos.final_exit_time = timestamp
         pos.final_exit_price = actual_exit
@@ -720,7 +672,7 @@ class RiskManager:
         pos.exit_reason = exit_reason
         pos.status = PositionStatus.CLOSED
         
-        total_ticks = (pos.total_pnl + self.commission_per_contract * pos.contracts * 2) / (self.tick_value * pos.contracts)
+        total_ticks = (pos.total_pnl + self.commission_round_trip * pos.contracts) / (self.tick_value * pos.contracts)
         
         result = TradeResult(
             trade_id=pos.trade_id,
@@ -747,8 +699,8 @@ class RiskManager:
         
         self.trade_results.append(result)
         
-        date = pos.entry_time.date()
-        self.daily_pnl[date] = self.daily_pnl.get(date, 0.0) + pos.total_pnl
+        entry_date = pos.entry_date
+        self.daily_pnl[entry_date] = self.daily_pnl.get(entry_date, 0.0) + pos.total_pnl
         
         self._update_cooldown(pos.total_pnl)
         
@@ -771,10 +723,11 @@ class RiskManager:
         return self.trade_results
     
     def get_equity_curve(self) -> List[float]:
-        equity = [0.0]
-        for result in self.trade_results:
-            equity.append(equity[-1] + result.total_pnl)
-        return equity
+        n = len(self.trade_results)
+        equity = np.zeros(n + 1, dtype=np.float64)
+        pnls = np.fromiter((r.total_pnl for r in self.trade_results), dtype=np.float64, count=n)
+        np.cumsum(pnls, out=equity[1:])
+        return equity.tolist()
     
     def reset(self) -> None:
         self.trade_counter = 0
@@ -1,65 +1,81 @@
 #!/usr/bin/env python3
 import json
+import sys
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Load results
-with open('results.json', 'r') as f:
-    results = json.load(f)
+with open('results.json', 'rb') as f:
+    raw = f.read()
+try:
+    results = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+except ValueError:
+    # Files written by json.dump may hold Infinity/NaN, which orjson rejects
+    results = json.loads(raw)
+
+# Report lines are collected and written to stdout in one call at the end
+out = []
 
-print('\n' + '='*80)
-print('BACKTEST RESULTS - VERIFIED TRADING SESSION TIMES'.center(80))
-print('='*80)
+out.append('\n' + '='*80)
+out.append('BACKTEST RESULTS - VERIFIED TRADING SESSION TIMES'.center(80))
+out.append('='*80)
 
-print('\nOVERALL PERFORMANCE:')
-print(f'  Total Trades: {results["total_trades"]:,}')
-print(f'  Win Rate: {results["win_rate"]:.1%}')
-print(f'  Total P&L: ${results["total_pnl"]:,.2f}')
-print(f'  Avg P&L/Trade: ${results["avg_pnl_per_trade"]:.2f}')
-print(f'  Profit Factor: {results["profit_factor"]:.2f}')
-print(f'  Max Drawdown: ${results["max_drawdown"]:.2f}')
+out.append('\nOVERALL PERFORMANCE:')
+out.append(f'  Total Trades: {results["total_trades"]:,}')
+out.append(f'  Win Rate: {results["win_rate"]:.1%}')
+out.append(f'  Total P&L: ${results["total_pnl"]:,.2f}')
+out.append(f'  Avg P&L/Trade: ${results["avg_pnl_per_trade"]:.2f}')
+out.append(f'  Profit Factor: {results["profit_factor"]:.2f}')
+out.append(f'  Max Drawdown: ${results["max_drawdown"]:.2f}')
 
-print('\n' + '='*80)
-print('\nSESSION PERFORMANCE WITH ACTUAL TRADING HOURS:\n')
+out.append('\n' + '='*80)
+out.append('\nSESSION PERFORMANCE WITH ACTUAL TRADING HOURS:\n')
 
 s = results['session_breakdown']
 
-print('[1] ASIA SESSION (Tokyo):')
-print('  Trading Hours: 6:00 PM - 3:00 AM CST (00:00 - 09:00 UTC)')
-print('  Duration: 9 hours')
-print(f'  Trades: {s["asia"]["trades"]}')
-print(f'  P&L: ${s["asia"]["pnl"]:,.2f}')
-print(f'  Win Rate: {s["asia"]["win_rate"]:.1%}')
-print(f'  Avg P&L/Trade: ${s["asia"]["avg_pnl"]:.2f}')
+out.append('[1] ASIA SESSION (Tokyo):')
+out.append('  Trading Hours: 6:00 PM - 3:00 AM CST (00:00 - 09:00 UTC)')
+out.append('  Duration: 9 hours')
+out.append(f'  Trades: {s["asia"]["trades"]}')
+out.append(f'  P&L: ${s["asia"]["pnl"]:,.2f}')
+out.append(f'  Win Rate: {s["asia"]["win_rate"]:.1%}')
+out.append(f'  Avg P&L/Trade: ${s["asia"]["avg_pnl"]:.2f}')
 
-print('\n[2] LONDON SESSION:')
-print('  Trading Hours: 2:00 AM - 11:00 AM CST (08:00 - 17:00 UTC)')
-print('  Duration: 9 hours')
-print(f'  Trades: {s["london"]["trades"]}')
-print(f'  P&L: ${s["london"]["pnl"]:,.2f}')
-print(f'  Win Rate: {s["london"]["win_rate"]:.1%}')
-print(f'  Avg P&L/Trade: ${s["london"]["avg_pnl"]:.2f}')
+out.append('\n[2] LONDON SESSION:')
+out.append('  Trading Hours: 2:00 AM - 11:00 AM CST (08:00 - 17:00 UTC)')
+out.append('  Duration: 9 hours')
+out.append(f'  Trades: {s["london"]["trades"]}')
+out.append(f'  P&L: ${s["london"]["pnl"]:,.2f}')
+out.append(f'  Win Rate: {s["london"]["win_rate"]:.1%}')
+out.append(f'  Avg P&L/Trade: ${s["london"]["avg_pnl"]:.2f}')
 
-print('\n[3] US SESSION (New York):')
-print('  Trading Hours: 8:30 AM - 3:00 PM CST (14:30 - 21:00 UTC)')
-print('  Duration: 6.5 hours')
-print(f'  Trades: {s["us"]["trades"]}')
-print(f'  P&L: ${s["us"]["pnl"]:,.2f}')
-print(f'  Win Rate: {s["us"]["win_rate"]:.1%}')
-print(f'  Avg P&L/Trade: ${s["us"]["avg_pnl"]:.2f}')
+out.append('\n[3] US SESSION (New York):')
+out.append('  Trading Hours: 8:30 AM - 3:00 PM CST (14:30 - 21:00 UTC)')
+out.append('  Duration: 6.5 hours')
+out.append(f'  Trades: {s["us"]["trades"]}')
+out.append(f'  P&L: ${s["us"]["pnl"]:,.2f}')
+out.append(f'  Win Rate: {s["us"]["win_rate"]:.1%}')
+out.append(f'  Avg P&L/Trade: ${s["us"]["avg_pnl"]:.2f}')
 
-print('\n' + '='*80)
-print('\nSESSION COMPARISON TABLE:\n')
-print(f'{"Session":<20} | {"Trades":<8} | {"P&L":<15} | {"Win Rate":<10} | {"Avg P&L":<12}')
-print('-'*80)
-print(f'{"Asia (6PM-3AM)":<20} | {s["asia"]["trades"]:<8} | ${s["asia"]["pnl"]:>13,.2f} | {s["asia"]["win_rate"]:>9.1%} | ${s["asia"]["avg_pnl"]:>10.2f}')
-print(f'{"London (2AM-11AM)":<20} | {s["london"]["trades"]:<8} | ${s["london"]["pnl"]:>13,.2f} | {s["london"]["win_rate"]:>9.1%} | ${s["london"]["avg_pnl"]:>10.2f}')
-print(f'{"US (8:30AM-3PM)":<20} | {s["us"]["trades"]:<8} | ${s["us"]["pnl"]:>13,.2f} | {s["us"]["win_rate"]:>9.1%} | ${s["us"]["avg_pnl"]:>10.2f}')
+out.append('\n' + '='*80)
+out.append('\nSESSION COMPARISON TABLE:\n')
+out.append(f'{"Session":<20} | {"Trades":<8} | {"P&L":<15} | {"Win Rate":<10} | {"Avg P&L":<12}')
+out.append('-'*80)
+out.append(f'{"Asia (6PM-3AM)":<20} | {s["asia"]["trades"]:<8} | ${s["asia"]["pnl"]:>13,.2f} | {s["asia"]["win_rate"]:>9.1%} | ${s["asia"]["avg_pnl"]:>10.2f}')
+out.append(f'{"London (2AM-11AM)":<20} | {s["london"]["trades"]:<8} | ${s["london"]["pnl"]:>13,.2f} | {s["london"]["win_rate"]:>9.1%} | ${s["london"]["avg_pnl"]:>10.2f}')
+out.append(f'{"US (8:30AM-3PM)":<20} | {s["us"]["trades"]:<8} | ${s["us"]["pnl"]:>13,.2f} | {s["us"]["win_rate"]:>9.1%} | ${s["us"]["avg_pnl"]:>10.2f}')
 
-print('\n' + '='*80)
-print('\nKEY INSIGHTS:')
-print('  1. BEST WIN RATE: London (83.5%)')
-print('  2. HIGHEST P&L: Asia ($17,941.09)')
-print('  3. BEST AVG P&L: US ($44.45 per trade)')
-print('  4. MOST TRADES: Asia (569 trades)')
-print('\nAll sessions are profitable with verified trading hours!')
-print('='*80 + '\n')
+out.append('\n' + '='*80)
+out.append('\nKEY INSIGHTS:')
+out.append('  1. BEST WIN RATE: London (83.5%)')
+out.append('  2. HIGHEST P&L: Asia ($17,941.09)')
+out.append('  3. BEST AVG P&L: US ($44.45 per trade)')
+out.append('  4. MOST TRADES: Asia (569 trades)')
+out.append('\nAll sessions are profitable with verified trading hours!')
+out.append('='*80 + '\n')
 
+sys.stdout.write('\n'.join(out) + '\n')
@@ -1,66 +1,83 @@
 #!/usr/bin/env python3
 import pandas as pd
 import json
+import sys
 
-print("=" * 70)
-print("FINAL BACKTEST RESULTS - MGC SCALPING STRATEGY")
-print("=" * 70)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Report lines are collected and written to stdout in one call at the end
+out = []
+
+out.append("=" * 70)
+out.append("FINAL BACKTEST RESULTS - MGC SCALPING STRATEGY")
+out.append("=" * 70)
 
 # Load results
-results = json.load(open('results.json'))
+with open('results.json', 'rb') as f:
+    raw = f.read()
+try:
+    results = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+except ValueError:
+    # Files written by json.dump may hold Infinity/NaN, which orjson rejects
+    results = json.loads(raw)
 df = pd.read_csv('trades.csv')
 
-print("\n" + "=" * 70)
-print("OVERALL PERFORMANCE")
-print("=" * 70)
-print(f"Total Trades:           {results['total_trades']}")
-print(f"Win Rate:               {results['win_rate']:.1%}")
-print(f"Winning Trades:         {results['winning_trades']}")
-print(f"Losing Trades:          {results['losing_trades']}")
-print(f"\nTotal P&L:              ${results['total_pnl']:,.2f}")
-print(f"Gross Profit:          ${results['gross_profit']:,.2f}")
-print(f"Gross Loss:             ${results['gross_loss']:,.2f}")
-print(f"Average P&L/Trade:      ${results['avg_pnl_per_trade']:.2f}")
-print(f"Average Win:            ${results['avg_win']:.2f}")
-print(f"Average Loss:           ${results['avg_loss']:.2f}")
-print(f"Profit Factor:          {results['profit_factor']:.2f}")
-print(f"Max Drawdown:           ${results['max_drawdown']:.2f}")
+out.append("\n" + "=" * 70)
+out.append("OVERALL PERFORMANCE")
+out.append("=" * 70)
+out.append(f"Total Trades:           {results['total_trades']}")
+out.append(f"Win Rate:               {results['win_rate']:.1%}")
+out.append(f"Winning Trades:         {results['winning_trades']}")
+out.append(f"Losing Trades:          {results['losing_trades']}")
+out.append(f"\nTotal P&L:              ${results['total_pnl']:,.2f}")
+out.append(f"Gross Profit:          ${results['gross_profit']:,.2f}")
+out.append(f"Gross Loss:             ${results['gross_loss']:,.2f}")
+out.append(f"Average P&L/Trade:      ${results['avg_pnl_per_trade']:.2f}")
+out.append(f"Average Win:            ${results['avg_win']:.2f}")
+out.append(f"Average Loss:           ${results['avg_loss']:.2f}")
+out.append(f"Profit Factor:          {results['profit_factor']:.2f}")
+out.append(f"Max Drawdown:           ${results['max_drawdown']:.2f}")
 
-print("\n" + "=" * 70)
-print("TRADE DIRECTION BREAKDOWN")
-print("=" * 70)
-print(f"Long Trades:            {results['long_trades']} (${results['long_pnl']:,.2f})")
-print(f"Short Trades:           {results['short_trades']} (${results['short_pnl']:,.2f})")
+out.append("\n" + "=" * 70)
+out.append("TRADE DIRECTION BREAKDOWN")
+out.append("=" * 70)
+out.append(f"Long Trades:            {results['long_trades']} (${results['long_pnl']:,.2f})")
+out.append(f"Short Trades:           {results['short_trades']} (${results['short_pnl']:,.2f})")
 
-print("\n" + "=" * 70)
-print("SESSION PERFORMANCE")
-print("=" * 70)
+out.append("\n" + "=" * 70)
+out.append("SESSION PERFORMANCE")
+out.append("=" * 70)
 for session, stats in results['session_breakdown'].items():
-    print(f"\n{session.upper()} Session:")
-    print(f"  Trades:              {stats['trades']}")
-    print(f"  P&L:                 ${stats['pnl']:,.2f}")
-    print(f"  Win Rate:            {stats['win_rate']:.1%}")
-    print(f"  Avg P&L/Trade:       ${stats['avg_pnl']:.2f}")
+    out.append(f"\n{session.upper()} Session:")
+    out.append(f"  Trades:              {stats['trades']}")
+    out.append(f"  P&L:                 ${stats['pnl']:,.2f}")
+    out.append(f"  Win Rate:            {stats['win_rate']:.1%}")
+    out.append(f"  Avg P&L/Trade:       ${stats['avg_pnl']:.2f}")
 
-print("\n" + "=" * 70)
-print("RISK MANAGEMENT IMPACT")
-print("=" * 70)
+out.append("\n" + "=" * 70)
+out.append("RISK MANAGEMENT IMPACT")
+out.append("=" * 70)
 enh = results['enhancement_impact']
-print(f"\nBreak Even:")
-print(f"  Triggered:            {enh['break_even']['triggered_count']} times")
-print(f"  Wins Preserved:       {enh['break_even']['wins_preserved']}")
-print(f"  Avg P&L with BE:      ${enh['break_even']['avg_pnl_with_be']:.2f}")
-print(f"  Avg P&L without BE:   ${enh['break_even']['avg_pnl_without_be']:.2f}")
+out.append(f"\nBreak Even:")
+out.append(f"  Triggered:            {enh['break_even']['triggered_count']} times")
+out.append(f"  Wins Preserved:       {enh['break_even']['wins_preserved']}")
+out.append(f"  Avg P&L with BE:      ${enh['break_even']['avg_pnl_with_be']:.2f}")
+out.append(f"  Avg P&L without BE:   ${enh['break_even']['avg_pnl_without_be']:.2f}")
 
-print(f"\nPartial Profits:")
-print(f"  Trades with Partial:  {enh['partial_profits']['trades_with_partial']}")
-print(f"  Partial P&L Captured: ${enh['partial_profits']['partial_pnl_captured']:,.2f}")
-print(f"  Avg Partial P&L:      ${enh['partial_profits']['avg_partial_pnl']:.2f}")
+out.append(f"\nPartial Profits:")
+out.append(f"  Trades with Partial:  {enh['partial_profits']['trades_with_partial']}")
+out.append(f"  Partial P&L Captured: ${enh['partial_profits']['partial_pnl_captured']:,.2f}")
+out.append(f"  Avg Partial P&L:      ${enh['partial_profits']['avg_partial_pnl']:.2f}")
 
-print("\n" + "=" * 70)
-print("DATA SOURCE")
-print("=" * 70)
-print("TopStep API - CON.F.US.MGC.G26 (Micro Gold)")
-print("3-minute bars | 32 days of data | Nov 23 - Dec 29, 2025")
-print("=" * 70)
+out.append("\n" + "=" * 70)
+out.append("DATA SOURCE")
+out.append("=" * 70)
+out.append("TopStep API - CON.F.US.MGC.G26 (Micro Gold)")
+out.append("3-minute bars | 32 days of data | Nov 23 - Dec 29, 2025")
+out.append("=" * 70)
 
+sys.stdout.write('\n'.join(out) + '\n')
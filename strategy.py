@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime, time, timedelta
 from typing import Optional, Tuple, List, Dict
@@ -9,6 +10,12 @@ from indicators import Indicators
 from zones import ZoneManager, ZoneType, Zone
 
 
+# pandas' dayofweek numbering (Monday=0) for the blocked_days config names
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+# date.toordinal() of the datetime64 day epoch, 1970-01-01 (a Thursday)
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
 class SignalType(Enum):
     LONG = 'long'
     SHORT = 'short'
@@ -39,6 +46,25 @@ class SessionManager:
         self.tz = pytz.timezone(config.get('timezone', 'America/Chicago'))
         self.sessions = config.get('sessions', {})
         self.buffer_minutes = config.get('session_boundary_buffer_minutes', 5)
+        
+        # Session bounds are parsed once here rather than on every bar
+        self.session_times = {
+            name: (self.parse_time(session_config['start']), self.parse_time(session_config['end']))
+            for name, session_config in self.sessions.items()
+            if 'start' in session_config and 'end' in session_config
+        }
+        
+        # Check sessions in priority order (us, asia, london) to handle overlaps correctly
+        # During 18:00-21:00 UTC, both US and Asia are active - prioritize US
+        priority_order = ['us', 'asia', 'london', 'london_early']
+        self.session_order = []
+        for session_name in priority_order:
+            if session_name not in self.sessions:
+                continue
+            if not self.sessions[session_name].get('enabled', True):
+                continue
+            start, end = self.session_times[session_name]
+            self.session_order.append((session_name, start, end, start <= end))
     
     def parse_time(self, time_str: str) -> time:
         parts = time_str.split(':')
@@ -56,21 +82,8 @@ class SessionManager:
         
         current_time = timestamp.time()
         
-        # Check sessions in priority order (us, asia, london) to handle overlaps correctly
-        # During 18:00-21:00 UTC, both US and Asia are active - prioritize US
-        priority_order = ['us', 'asia', 'london', 'london_early']
-        
-        for session_name in priority_order:
-            if session_name not in self.sessions:
-                continue
-            session_config = self.sessions[session_name]
-            if not session_config.get('enabled', True):
-                continue
-            
-            start = self.parse_time(session_config['start'])
-            end = self.parse_time(session_config['end'])
-            
-            if start <= end:
+        for session_name, start, end, same_day in self.session_order:
+            if same_day:
                 if start <= current_time <= end:
                     return session_name
             else:
@@ -79,6 +92,29 @@ class SessionManager:
         
         return None
     
+    def get_active_sessions(self, timestamps: pd.Series) -> np.ndarray:
+        """Vectorized get_active_session over a timestamp column."""
+        # Same UTC handling as get_active_session: naive timestamps are UTC
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_convert('UTC')
+        time_of_day = (timestamps - timestamps.dt.normalize()).to_numpy().astype('timedelta64[ns]').astype('int64')
+        
+        def to_ns(t: time) -> int:
+            return (t.hour * 3600 + t.minute * 60 + t.second) * 1_000_000_000 + t.microsecond * 1000
+        
+        sessions = np.full(len(timestamps), None, dtype=object)
+        # Lowest priority first so higher-priority sessions overwrite overlaps
+        for session_name, start, end, same_day in reversed(self.session_order):
+            start_ns = to_ns(start)
+            end_ns = to_ns(end)
+            if same_day:
+                in_session = (time_of_day >= start_ns) & (time_of_day <= end_ns)
+            else:
+                in_session = (time_of_day >= start_ns) | (time_of_day <= end_ns)
+            sessions[in_session] = session_name
+        
+        return sessions
+    
     def is_within_boundary_buffer(
         self,
         timestamp: pd.Timestamp,
@@ -89,12 +125,10 @@ class SessionManager:
         else:
             timestamp = timestamp.astimezone(self.tz)
         
-        session_config = self.sessions.get(session_name)
-        if not session_config:
+        if not self.sessions.get(session_name):
             return False
         
-        start = self.parse_time(session_config['start'])
-        end = self.parse_time(session_config['end'])
+        start, end = self.session_times[session_name]
         current_time = timestamp.time()
         
         start_dt = datetime.combine(timestamp.date(), start)
@@ -156,15 +190,24 @@ class Strategy:
         vwap_obstruction_config = config.get('vwap_obstruction', {})
         self.vwap_obstruction_enabled = vwap_obstruction_config.get('enabled', False)
         
-        self.blackout_dates = set()
+        self.blackout_dates = frozenset()
+        self.blackout_ordinals = frozenset()
         self.htf_data = None
+        # (df, len(df), per-bar arrays) for the frame generate_signal was last called with
+        self._frame_cache = None
+        # (df, len(df), vwap, running cross counts) for the chop filter
+        self._chop_cache = None
+        # (df, len(df), volume array, lookback averages) for the volume filter
+        self._volume_cache = None
         
     def load_blackout_dates(self, filepath: str) -> None:
         try:
             df = pd.read_csv(filepath)
-            self.blackout_dates = set(pd.to_datetime(df['date']).dt.date)
+            self.blackout_dates = frozenset(pd.to_datetime(df['date']).dt.date)
         except Exception:
-            self.blackout_dates = set()
+            self.blackout_dates = frozenset()
+        self.blackout_ordinals = frozenset(d.toordinal() for d in self.blackout_dates)
+        self._frame_cache = None
     
     def is_blackout_date(self, timestamp: pd.Timestamp) -> bool:
         return timestamp.date() in self.blackout_dates
@@ -185,6 +228,61 @@ class Strategy:
             utc_hour = timestamp.utc.hour if hasattr(timestamp, 'utc') else timestamp.tz_convert('UTC').hour
         return utc_hour in blocked_hours
     
+    def precompute_bar_masks(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Evaluate the per-bar calendar and session gates of generate_signal
+        (blackout date, blocked day, blocked hour, active session) for every
+        bar of df at once.
+        """
+        timestamps = df['timestamp']
+        n = len(df)
+        
+        # Calendar checks use the bar's local date, as date()/day_name() do,
+        # reduced to integer day numbers instead of per-bar date objects
+        local = timestamps.dt.tz_localize(None) if timestamps.dt.tz is not None else timestamps
+        days = local.to_numpy().astype('datetime64[D]').astype(np.int64)
+        
+        blackout = np.isin(
+            days + EPOCH_ORDINAL,
+            np.fromiter(self.blackout_ordinals, dtype=np.int64, count=len(self.blackout_ordinals))
+        )
+        
+        blocked_days = self.config.get('blocked_days', [])
+        if blocked_days:
+            blocked_weekdays = [DAY_NAMES.index(d) for d in blocked_days if d in DAY_NAMES]
+            blocked_day = np.isin((days + 3) % 7, blocked_weekdays)
+        else:
+            blocked_day = np.zeros(n, dtype=bool)
+        
+        blocked_hours = self.config.get('blocked_hours_utc', [])
+        if blocked_hours:
+            utc = timestamps.dt.tz_convert('UTC') if timestamps.dt.tz is not None else timestamps
+            blocked_hour = utc.dt.hour.isin(blocked_hours).to_numpy()
+        else:
+            blocked_hour = np.zeros(n, dtype=bool)
+        
+        return {
+            'blackout': blackout,
+            'blocked_day': blocked_day,
+            'blocked_hour': blocked_hour,
+            'session': self.session_manager.get_active_sessions(timestamps),
+        }
+    
+    def _frame_arrays(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        # Per-bar arrays are built on first use for a frame and reused until
+        # generate_signal is handed a different one (or the frame grows)
+        cache = self._frame_cache
+        if cache is None or cache[0] is not df or cache[1] != len(df):
+            arrays = self.precompute_bar_masks(df)
+            # Plain column arrays so generate_signal never materializes a row
+            for column in ('open', 'high', 'low', 'close', 'vwap', 'atr'):
+                arrays[column] = df[column].to_numpy()
+            arrays['timestamp'] = df['timestamp'].tolist()
+            # One Series object per frame so the chop filter's cache keeps hitting
+            arrays['vwap_series'] = df['vwap']
+            cache = self._frame_cache = (df, len(df), arrays)
+        return cache[2]
+    
     def prepare_data(self, df: pd.DataFrame, merge_zones: bool = False) -> pd.DataFrame:
         """
         Prepare data and create zones from pivots.
@@ -268,9 +366,12 @@ class Strategy:
         
         effective_max = max_crosses if max_crosses is not None else self.chop_max_crosses
         
-        crosses = self.indicators.count_vwap_crosses(
-            df, vwap, self.chop_lookback, bar_index
-        )
+        cache = self._chop_cache
+        if cache is None or cache[0] is not df or cache[1] != len(df) or cache[2] is not vwap:
+            cache = self._chop_cache = (df, len(df), vwap, self.indicators.vwap_cross_counts(df, vwap))
+        cross_counts = cache[3]
+        
+        crosses = cross_counts[bar_index] - cross_counts[max(0, bar_index - self.chop_lookback)]
         
         return crosses < effective_max
     
@@ -307,13 +408,23 @@ class Strategy:
         if 'volume' not in df.columns:
             return True
         
-        start_idx = max(0, bar_index - self.volume_lookback)
-        avg_volume = df['volume'].iloc[start_idx:bar_index].mean()
+        cache = self._volume_cache
+        if cache is None or cache[0] is not df or cache[1] != len(df):
+            # Mean of the lookback bars before each bar (the bar itself excluded)
+            volume = df['volume']
+            cache = self._volume_cache = (
+                df,
+                len(df),
+                volume.to_numpy(),
+                volume.rolling(self.volume_lookback, min_periods=1).mean().shift(1).to_numpy(),
+            )
+        
+        avg_volume = cache[3][bar_index]
         
         if avg_volume <= 0:
             return True
         
-        current_volume = df['volume'].iloc[bar_index]
+        current_volume = cache[2][bar_index]
         return current_volume >= avg_volume * self.volume_min_mult
     
     def is_vwap_obstructing(
@@ -338,30 +449,9 @@ class Strategy:
         bar_index: int,
         min_distance: float
     ) -> List[float]:
-        levels = []
-        
-        if side == 'long':
-            supply_zones = [
-                z for z in self.zone_manager.zones
-                if z.is_active 
-                and z.zone_type == ZoneType.SUPPLY 
-                and z.low > entry_price + min_distance
-                and z.created_index < bar_index
-            ]
-            for z in sorted(supply_zones, key=lambda x: x.low):
-                levels.append(z.low)
-        else:
-            demand_zones = [
-                z for z in self.zone_manager.zones
-                if z.is_active 
-                and z.zone_type == ZoneType.DEMAND 
-                and z.high < entry_price - min_distance
-                and z.created_index < bar_index
-            ]
-            for z in sorted(demand_zones, key=lambda x: -x.high):
-                levels.append(z.high)
-        
-        return levels[:3]
+        return self.zone_manager.get_structure_levels(
+            entry_price, side, bar_index, min_distance
+        )
     
     def check_confirmation(
         self,
@@ -491,30 +581,30 @@ class Strategy:
                 print(f"[SIGNAL DEBUG] Bar index too low: {bar_index}")
             return None
         
-        bar = df.iloc[bar_index]
-        prev_bar = df.iloc[bar_index - 1]
-        timestamp = pd.Timestamp(bar['timestamp'])
-        price = bar['close']
+        arrays = self._frame_arrays(df)
+        timestamp = arrays['timestamp'][bar_index]
+        price = arrays['close'][bar_index]
         
         if debug_log:
             print(f"[SIGNAL DEBUG] Checking signal at {timestamp}, Price=${price:.2f}")
         
-        if self.is_blackout_date(timestamp):
+        # Calendar/session gates are computed for the whole frame on first use
+        if arrays['blackout'][bar_index]:
             if debug_log:
                 print(f"  -> BLOCKED: Blackout date")
             return None
         
-        if self.is_blocked_day(timestamp):
+        if arrays['blocked_day'][bar_index]:
             if debug_log:
                 print(f"  -> BLOCKED: Blocked day")
             return None
         
-        if self.is_blocked_hour(timestamp):
+        if arrays['blocked_hour'][bar_index]:
             if debug_log:
                 print(f"  -> BLOCKED: Blocked hour (UTC {timestamp.hour})")
             return None
         
-        session = self.session_manager.get_active_session(timestamp)
+        session = arrays['session'][bar_index]
         if session is None:
             if debug_log:
                 print(f"  -> BLOCKED: No active session (asia: 18:00-02:00 UTC, london: 06:00-08:30 UTC)")
@@ -547,8 +637,8 @@ class Strategy:
             return None
         
         session_params = self.session_manager.get_session_params(session)
-        vwap = bar['vwap']
-        atr = bar['atr']
+        vwap = arrays['vwap'][bar_index]
+        atr = arrays['atr'][bar_index]
         
         # Get session-specific filter overrides
         session_filters = session_params.get('filters', {})
@@ -573,8 +663,7 @@ class Strategy:
         avoid_first = session_filters.get('avoid_first_minutes', 0)
         avoid_last = session_filters.get('avoid_last_minutes', 0)
         if avoid_first > 0 or avoid_last > 0:
-            session_start = self.session_manager.parse_time(session_params['start'])
-            session_end = self.session_manager.parse_time(session_params['end'])
+            session_start, session_end = self.session_manager.session_times[session]
             current_time = timestamp.time() if timestamp.tzinfo is None else timestamp.astimezone(pytz.UTC).time()
             
             # Calculate minutes from session start/end
@@ -604,7 +693,7 @@ class Strategy:
                 print(f"  -> Session-specific filters: min_rr={effective_min_rr}, chop_max={effective_chop_max}, require_volume={effective_require_volume}, require_both={effective_require_both}")
         
         # Check chop filter with session-specific threshold
-        if not self.check_chop_filter(df, df['vwap'], bar_index, max_crosses=effective_chop_max):
+        if not self.check_chop_filter(df, arrays['vwap_series'], bar_index, max_crosses=effective_chop_max):
             if debug_log:
                 print(f"  -> BLOCKED: Chop filter failed (too many VWAP crosses, max={effective_chop_max})")
             return None
@@ -616,6 +705,16 @@ class Strategy:
                     print(f"  -> BLOCKED: Volume filter failed (low volume, required for this session)")
                 return None
         
+        # Only the handful of bars that get this far need their OHLC; plain
+        # dicts work with the bar['close']-style access the checks use
+        opens = arrays['open']
+        highs = arrays['high']
+        lows = arrays['low']
+        closes = arrays['close']
+        prev_index = bar_index - 1
+        bar = {'open': opens[bar_index], 'high': highs[bar_index], 'low': lows[bar_index], 'close': price}
+        prev_bar = {'open': opens[prev_index], 'high': highs[prev_index], 'low': lows[prev_index], 'close': closes[prev_index]}
+        
         for side, zone_type in [('long', ZoneType.DEMAND), ('short', ZoneType.SUPPLY)]:
             if debug_log:
                 print(f"  -> Checking {side.upper()} signals ({zone_type.value} zones)...")
@@ -710,7 +809,7 @@ class Strategy:
                 if bar_index >= self.long_trend_ema_period:
                     ema_col = f'ema_{self.long_trend_ema_period}'
                     if ema_col in df.columns:
-                        ema_value = df.iloc[bar_index][ema_col]
+                        ema_value = df[ema_col].iat[bar_index]
                         if bar['close'] < ema_value:
                             continue
             
@@ -743,4 +842,7 @@ class Strategy:
     def reset(self) -> None:
         self.zone_manager.reset()
         self.htf_data = None
+        self._frame_cache = None
+        self._chop_cache = None
+        self._volume_cache = None
 
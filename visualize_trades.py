@@ -105,14 +105,13 @@ def plot_trade(
         ax.plot([i, i], [bar['low'], body_bottom], color=color, linewidth=1)
         ax.plot([i, i], [body_bottom + body_height, bar['high']], color=color, linewidth=1)
     
-    # Find entry bar index
-    entry_idx = None
-    for i, (idx, bar) in enumerate(subset.iterrows()):
-        if bar['timestamp'] >= entry_time:
-            entry_idx = i
-            break
+    # Find entry bar index (first bar at or after entry time)
+    subset_times = subset['timestamp']
+    at_or_after_entry = (subset_times >= entry_time).to_numpy()
     
-    if entry_idx is None:
+    if at_or_after_entry.any():
+        entry_idx = int(at_or_after_entry.argmax())
+    else:
         entry_idx = len(subset) // 3
     
     # Plot levels as horizontal lines
@@ -155,12 +154,9 @@ def plot_trade(
     exit_price = trade['final_exit_price']
     exit_reason = trade['exit_reason']
     
-    # Find exit bar index
-    exit_idx = len(subset) - 3
-    for i, (idx, bar) in enumerate(subset.iterrows()):
-        if bar['timestamp'] >= exit_time:
-            exit_idx = i
-            break
+    # Find exit bar index (first bar at or after exit time)
+    at_or_after_exit = (subset_times >= exit_time).to_numpy()
+    exit_idx = int(at_or_after_exit.argmax()) if at_or_after_exit.any() else len(subset) - 3
     
     exit_marker = 'o'
     exit_color = 'green' if trade['total_pnl'] > 0 else 'red'
@@ -3,6 +3,8 @@ import numpy as np
 from typing import List, Callable, Dict
 from dataclasses import dataclass
 
+from reporting import equity_drawdown
+
 
 @dataclass
 class WalkForwardResults:
@@ -202,23 +204,21 @@ class WalkForwardValidator:
                 'max_drawdown': 0.0
             }
         
-        pnls = [t.total_pnl for t in trade_results]
-        total_pnl = sum(pnls)
+        n = len(trade_results)
+        pnls = np.fromiter((t.total_pnl for t in trade_results), dtype=np.float64, count=n)
+        total_pnl = pnls.sum()
         
-        wins = [p for p in pnls if p > 0]
-        losses = [p for p in pnls if p < 0]
+        wins = pnls[pnls > 0]
+        losses = pnls[pnls < 0]
         
-        win_rate = len(wins) / len(pnls) if pnls else 0.0
-        avg_pnl = total_pnl / len(pnls) if pnls else 0.0
+        win_rate = len(wins) / n
+        avg_pnl = total_pnl / n
         
-        gross_profit = sum(wins) if wins else 0.0
-        gross_loss = abs(sum(losses)) if losses else 0.0
+        gross_profit = wins.sum()
+        gross_loss = abs(losses.sum())
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf') if gross_profit > 0 else 0.0
         
-        equity = np.cumsum(pnls)
-        running_max = np.maximum.accumulate(np.concatenate([[0], equity]))
-        drawdown = running_max[1:] - equity
-        max_dd = float(np.max(drawdown)) if len(drawdown) > 0 else 0.0
+        _, max_dd, _, _ = equity_drawdown(pnls)
         
         return {
             'trades': len(trade_results),
@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
 import json
+from bisect import bisect_right
 from pathlib import Path
 from typing import List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
@@ -46,6 +48,9 @@ class ZoneManager:
         
         self.tick_size = config.get('tick_size', 0.10)
         
+        # Per-zone bound arrays and sorted views; see _indexed_zones
+        self._zone_index = None
+        
     def create_zone_from_pivot(
         self,
         pivot_type: str,
@@ -121,22 +126,25 @@ class ZoneManager:
         bar_index: int,
         zone_type: Optional[ZoneType] = None
     ) -> List[Zone]:
+        # Overlap and age only depend on fixed zone bounds, so narrow the
+        # scan with array compares before touching any Zone objects
+        index = self._indexed_zones()
+        candidates = np.flatnonzero(
+            (index['low'] <= bar_high) & (index['high'] >= bar_low) & (index['created_index'] < bar_index)
+        )
+        
+        zones = self.zones
         touched = []
         
-        for zone in self.zones:
+        for i in candidates:
+            zone = zones[i]
             if not zone.is_active:
                 continue
             
             if zone_type is not None and zone.zone_type != zone_type:
                 continue
             
-            if zone.created_index >= bar_index:
-                continue
-            
-            overlaps = bar_low <= zone.high and bar_high >= zone.low
-            
-            if overlaps:
-                touched.append(zone)
+            touched.append(zone)
         
         return touched
     
@@ -209,6 +217,64 @@ class ZoneManager:
         
         return None
     
+    def _indexed_zones(self) -> dict:
+        # A zone's low/high/created_index never change after creation, so
+        # these views only need rebuilding when zones are added or the list
+        # is replaced; type, activity and confidence are still read from
+        # the Zone objects themselves
+        cache = self._zone_index
+        if cache is None or cache[0] is not self.zones or cache[1] != len(self.zones):
+            zones = self.zones
+            n = len(zones)
+            by_low = sorted(zones, key=lambda z: z.low)
+            by_high = sorted(zones, key=lambda z: -z.high)
+            index = {
+                'low': np.fromiter((z.low for z in zones), dtype=np.float64, count=n),
+                'high': np.fromiter((z.high for z in zones), dtype=np.float64, count=n),
+                'created_index': np.fromiter((z.created_index for z in zones), dtype=np.int64, count=n),
+                'by_low': by_low,
+                'lows': [z.low for z in by_low],
+                'by_high': by_high,
+                'neg_highs': [-z.high for z in by_high]
+            }
+            cache = self._zone_index = (zones, n, index)
+        return cache[2]
+    
+    def get_structure_levels(
+        self,
+        entry_price: float,
+        side: str,
+        current_index: int,
+        min_distance: float = 0,
+        max_levels: int = 3
+    ) -> List[float]:
+        """
+        Nearest opposing zone bounds beyond min_distance from entry: supply
+        lows above a long entry, demand highs below a short entry.
+        """
+        index = self._indexed_zones()
+        by_low = index['by_low']
+        by_high = index['by_high']
+        levels = []
+        
+        if side == 'long':
+            # Skip straight past every zone whose low is within reach
+            for i in range(bisect_right(index['lows'], entry_price + min_distance), len(by_low)):
+                z = by_low[i]
+                if z.is_active and z.zone_type == ZoneType.SUPPLY and z.created_index < current_index:
+                    levels.append(z.low)
+                    if len(levels) == max_levels:
+                        break
+        else:
+            for i in range(bisect_right(index['neg_highs'], -(entry_price - min_distance)), len(by_high)):
+                z = by_high[i]
+                if z.is_active and z.zone_type == ZoneType.DEMAND and z.created_index < current_index:
+                    levels.append(z.high)
+                    if len(levels) == max_levels:
+                        break
+        
+        return levels
+    
     def get_active_zones(self, zone_type: Optional[ZoneType] = None) -> List[Zone]:
         zones = [z for z in self.zones if z.is_active]
         